@@ -1,13 +1,13 @@
-import os
 import requests
 
-NOTION_TOKEN = os.getenv("NOTION_INTERNAL_SECRET")
-DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
+from config import env
 
-url = f"https://api.notion.com/v1/databases/{DATABASE_ID}"
+cfg = env()
+
+url = f"https://api.notion.com/v1/databases/{cfg.notion_db_id}"
 
 headers = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
+    "Authorization": f"Bearer {cfg.notion_secret}",
     "Notion-Version": "2022-06-28",
 }
 
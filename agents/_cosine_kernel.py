@@ -0,0 +1,27 @@
+"""
+Numba kernel behind agents.numba_cosine
+Imported lazily because importing numba costs hundreds of milliseconds
+"""
+import numpy as np
+from numba import njit
+
+
+# Serial: the pool holds at most RESPONSE_CACHE_SIZE rows, too few for threads to pay off
+@njit(fastmath=True, cache=True)
+def topk_cosine_numba(mat, q, thresh):
+    n = mat.shape[0]
+    if n == 0:
+        return -1
+
+    scores = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        acc = np.float32(0.0)
+        for j in range(q.shape[0]):
+            acc += mat[i, j] * q[j]
+        scores[i] = acc
+
+    best = 0
+    for i in range(1, n):
+        if scores[i] > scores[best]:
+            best = i
+    return best if scores[best] >= thresh else -1
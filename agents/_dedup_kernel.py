@@ -0,0 +1,21 @@
+"""
+Numba kernel behind agents.numba_dedup
+Imported lazily because importing numba costs hundreds of milliseconds
+"""
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+
+@njit(cache=True)
+def find_duplicates_numba(hashes, ids):
+    keep = Dict.empty(key_type=types.uint64, value_type=types.int64)
+    for i in range(hashes.shape[0]):
+        h = hashes[i]
+        if h not in keep or ids[i] < keep[h]:
+            keep[h] = ids[i]
+
+    out = np.empty(hashes.shape[0], dtype=np.int64)
+    for i in range(hashes.shape[0]):
+        out[i] = keep[hashes[i]]
+    return out
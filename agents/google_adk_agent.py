@@ -3,20 +3,140 @@ Google ADK (Agent Development Kit) Agent Implementation
 This agent uses Google's Gemini API for task management
 """
 import os
-import google.generativeai as genai
+import asyncio
+import threading
+import numpy as np
 from dotenv import load_dotenv
+from config import env
 from tools.task_tools import TaskTools
 from tools.calendar_tool import CalendarTool
+from agents.numba_cosine import topk_cosine
+from agents.numba_dedup import find_duplicates
 from observability.langfuse_config import trace_agent_execution, log_agent_event, get_langfuse_client
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional, Tuple, List, Iterator, Generator
+# pydantic, which builds the response schema, rejects typing.TypedDict before Python 3.12
+from typing_extensions import TypedDict
+from collections import OrderedDict
+from operator import itemgetter
 import re
-from datetime import datetime, timedelta
+import orjson
+from datetime import date, datetime
 
 load_dotenv()
 
+# Response cache settings
+RESPONSE_CACHE_SIZE = 512
+PLAN_CACHE_SIZE = 512
+
+# Cosine similarity at or above which two tasks are duplicates; pairs between
+# the borderline and duplicate thresholds are confirmed with Gemini
+DUPLICATE_THRESHOLD = 0.85
+BORDERLINE_THRESHOLD = 0.80
+
+# Maximum number of requests processed concurrently by run_batch
+BATCH_CONCURRENCY = 8
+SIMILARITY_THRESHOLD = 0.93
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Actions that don't mutate the task store, so their responses can be reused
+CACHEABLE_ACTIONS = frozenset({"list", "statistics", "general"})
+# Actions whose cached responses may be matched semantically. List and statistics
+# output depends on parameters planned later (e.g. the status filter), so near-identical
+# phrasings can need different answers; those are only reused on an exact match.
+SEMANTIC_CACHE_ACTIONS = frozenset({"general"})
+
+# Actions answered without Gemini when keyword routing is unambiguous
+LOCAL_ACTIONS = frozenset({"list", "statistics", "deduplicate"})
+
+# Actions the agent knows how to execute
+VALID_ACTIONS = ("create", "list", "update", "delete", "statistics", "deduplicate", "general")
+
+# Placeholder in the response template that is replaced by the operation result
+RESULT_PLACEHOLDER = "{result}"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Task fields embedded for deduplication
+_DEDUP_FIELDS = ("title", "description")
+_dedup_fields = itemgetter(*_DEDUP_FIELDS)
+_task_id = itemgetter("id")
+
+# google.generativeai pulls in gRPC and protobuf, so it is imported on first use
+_genai = None
+
+
+def _load_genai(api_key: str):
+    """Import and configure google.generativeai once per process"""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        _genai = genai
+    return _genai
+
+
+class TaskParams(TypedDict, total=False):
+    """Task parameters extracted from a user request"""
+    title: str
+    description: str
+    priority: str
+    status: str
+    due_date: str
+    task_id: int
+
+
+class TaskPlan(TypedDict):
+    """Structured output of the single planning call"""
+    action: str
+    params: TaskParams
+    response_template: str
+
+
+PLAN_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": TaskPlan,
+}
+
+
+class DuplicateVerdict(TypedDict):
+    """Structured output of a borderline duplicate confirmation"""
+    duplicate: bool
+
+
+DUPLICATE_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": DuplicateVerdict,
+}
+
 class GoogleADKAgent:
     """Google ADK-based task management agent using Gemini"""
+
+    __slots__ = (
+        "_api_key", "_model_name", "_model", "task_tools", "calendar_tool",
+        "_exact_cache", "_emb_pool", "_emb_responses", "_emb_count", "_emb_next", "_cache_revision",
+        "_task_embeddings", "_plan_cache", "_cache_lock", "_execute_lock",
+    )
+
+    # Keyword routing for _parse_user_request: one regex scan, then a table lookup.
+    # Keywords only need a leading word boundary so plurals ("duplicates") still match;
+    # "deduplicate" is matched explicitly since "duplicate" has no boundary inside it.
+    _ACTION_PATTERN = re.compile(
+        r"\b(duplicate|deduplicate|new task|get tasks|tasks|create|add|list|show|update|change|modify|mark"
+        r"|delete|remove|statistics|stats|summary|overview|clean|check|find)"
+    )
+    _ACTION_MAP = {
+        "create": "create", "add": "create", "new task": "create",
+        "list": "list", "show": "list", "get tasks": "list", "tasks": "list",
+        "update": "update", "change": "update", "modify": "update", "mark": "update",
+        "delete": "delete", "remove": "delete",
+        "statistics": "statistics", "stats": "statistics", "summary": "statistics", "overview": "statistics",
+    }
+    # When several actions match, the first one in this order wins
+    _ACTION_PRIORITY = ("create", "list", "update", "delete", "statistics")
+    _DUPLICATE_KEYWORDS = frozenset({"duplicate", "deduplicate"})
+    _DEDUP_KEYWORDS = frozenset({"remove", "delete", "clean", "check", "find"})
+    # Status filter for locally handled list requests
+    _STATUS_PATTERN = re.compile(r"\b(pending|in[ _-]?progress|completed|cancell?ed)\b")
     
     def __init__(self, model_name: str = "gemini-2.5-flash"):
         """
@@ -25,29 +145,66 @@ class GoogleADKAgent:
         Args:
             model_name: Name of the Gemini model to use (default: gemini-2.5-flash)
         """
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+        api_key = env().gemini_key
         if not api_key:
             raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY must be set in .env file")
         
-        genai.configure(api_key=api_key)
-        
-        # Try to use the model name, or fallback to available models
-        try:
-            self.model = genai.GenerativeModel(model_name)
-        except Exception:
-            try:
-                if not model_name.startswith("models/"):
-                    self.model = genai.GenerativeModel(f"models/{model_name}")
-                else:
-                    self.model = genai.GenerativeModel("gemini-2.5-flash")
-            except Exception:
-                self.model = genai.GenerativeModel("gemini-2.5-flash")
+        # The Gemini SDK and model are loaded lazily by the model property
+        self._api_key = api_key
+        self._model_name = model_name
+        self._model = None
         
         self.task_tools = TaskTools()
         self.calendar_tool = CalendarTool() if os.path.exists("credentials.json") else None
+
+        # Response cache: exact match on the normalized request first, then
+        # cosine similarity over embeddings of recent requests
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
+        # Embeddings live in one contiguous float32 ring buffer, allocated on first insert
+        # once the embedding size is known; _emb_responses holds the matching responses
+        self._emb_pool: Optional[np.ndarray] = None
+        self._emb_responses: List[Optional[str]] = [None] * RESPONSE_CACHE_SIZE
+        self._emb_count = 0
+        self._emb_next = 0
+        self._cache_revision = self.task_tools.revision()
+
+        # Task embeddings for deduplication: task id -> (embedded text, normalized vector)
+        self._task_embeddings: Dict[int, Tuple[str, np.ndarray]] = {}
+
+        # Plans from _plan_and_extract keyed by (current date, normalized request)
+        self._plan_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+        # Guards the response and plan caches, which concurrent requests share
+        self._cache_lock = threading.Lock()
+        self._execute_lock = threading.Lock()
         
         log_agent_event("agent_initialized", "google_adk_agent", {"model": model_name, "status": "success"})
     
+    @property
+    def _genai(self):
+        """The configured google.generativeai module"""
+        return _load_genai(self._api_key)
+
+    @property
+    def model(self):
+        """Gemini model, created on first use"""
+        if self._model is None:
+            genai = self._genai
+            model_name = self._model_name
+
+            # Try to use the model name, or fallback to available models
+            try:
+                self._model = genai.GenerativeModel(model_name)
+            except Exception:
+                try:
+                    if not model_name.startswith("models/"):
+                        self._model = genai.GenerativeModel(f"models/{model_name}")
+                    else:
+                        self._model = genai.GenerativeModel("gemini-2.5-flash")
+                except Exception:
+                    self._model = genai.GenerativeModel("gemini-2.5-flash")
+        return self._model
+
     def _create_system_prompt(self) -> str:
         """Create the system prompt for the agent"""
         return """You are a helpful task management assistant powered by Google's Gemini AI.
@@ -61,6 +218,96 @@ You can help users with the following operations:
 When users make requests, analyze their intent and use the appropriate functions.
 Always provide clear, helpful responses."""
 
+    @staticmethod
+    def _normalize_request(user_request: str) -> str:
+        """Lowercase, strip and collapse whitespace so equivalent requests share a key"""
+        return _WHITESPACE_RE.sub(" ", user_request.strip().lower())
+
+    @staticmethod
+    def _normalize_embedding(result: Dict[str, Any]) -> Optional[np.ndarray]:
+        """L2-normalize an embed_content result so dot products are cosine similarities"""
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Return the L2-normalized embedding of text, or None if embedding fails"""
+        try:
+            result = self._genai.embed_content(model=EMBEDDING_MODEL, content=text)
+        except Exception:
+            return None
+        return self._normalize_embedding(result)
+
+    async def _aembed(self, text: str) -> Optional[np.ndarray]:
+        """Async variant of _embed"""
+        try:
+            result = await self._genai.embed_content_async(model=EMBEDDING_MODEL, content=text)
+        except Exception:
+            return None
+        return self._normalize_embedding(result)
+
+    def _sync_cache_revision(self):
+        """Drop cached responses once the task store has changed; call with _cache_lock held"""
+        revision = self.task_tools.revision()
+        if revision != self._cache_revision:
+            self._exact_cache.clear()
+            self._emb_count = 0
+            self._emb_next = 0
+            self._cache_revision = revision
+
+    def _match_exact(self, key: str) -> Optional[str]:
+        """Return the cached response for a normalized request, if any"""
+        with self._cache_lock:
+            self._sync_cache_revision()
+            cached = self._exact_cache.get(key)
+            if cached is not None:
+                self._exact_cache.move_to_end(key)
+            return cached
+
+    def _match_semantic(self, query: Optional[np.ndarray]) -> Optional[str]:
+        """Return the cached response whose request embedding is closest to query, if close enough"""
+        with self._cache_lock:
+            self._sync_cache_revision()
+            if query is None or not self._emb_count or query.shape[0] != self._emb_pool.shape[1]:
+                return None
+
+            best = topk_cosine(self._emb_pool[:self._emb_count], query, SIMILARITY_THRESHOLD)
+            return self._emb_responses[best] if best >= 0 else None
+
+    def _cache_response(self, key: str, response: str, embedding: Optional[np.ndarray], revision: int):
+        """
+        Store a response under both the exact and the semantic cache
+        
+        Args:
+            key: Normalized request
+            response: Response to reuse
+            embedding: Normalized request embedding, or None to cache the exact key only
+            revision: Task store revision read before the response was computed; the
+                response is dropped if the store has changed since
+        """
+        with self._cache_lock:
+            if revision != self.task_tools.revision():
+                return
+            self._sync_cache_revision()
+
+            self._exact_cache[key] = response
+            self._exact_cache.move_to_end(key)
+            if len(self._exact_cache) > RESPONSE_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+
+            if embedding is None:
+                return
+            if self._emb_pool is None or self._emb_pool.shape[1] != embedding.shape[0]:
+                self._emb_pool = np.empty((RESPONSE_CACHE_SIZE, embedding.shape[0]), dtype=np.float32)
+                self._emb_count = 0
+                self._emb_next = 0
+
+            row = self._emb_next
+            self._emb_pool[row] = embedding
+            self._emb_responses[row] = response
+            self._emb_next = (row + 1) % RESPONSE_CACHE_SIZE
+            self._emb_count = min(self._emb_count + 1, RESPONSE_CACHE_SIZE)
+
     def _parse_user_request(self, user_request: str) -> Dict[str, Any]:
         """
         Parse user request and determine the action
@@ -69,96 +316,259 @@ Always provide clear, helpful responses."""
             user_request: User's request text
             
         Returns:
-            Dictionary with action type and parameters
+            Dictionary with action type, the request, and whether only one action matched
         """
-        request_lower = user_request.lower()
+        matched = set(self._ACTION_PATTERN.findall(user_request.lower()))
         
-        if "duplicate" in request_lower and any(word in request_lower for word in ['remove', 'delete', 'clean', 'check', 'find']):
-            return {"action": "deduplicate", "request": user_request}
+        if not matched.isdisjoint(self._DUPLICATE_KEYWORDS) and not matched.isdisjoint(self._DEDUP_KEYWORDS):
+            return {"action": "deduplicate", "request": user_request, "unambiguous": True}
         
-        if any(word in request_lower for word in ['create', 'add', 'new task']):
-            return {"action": "create", "request": user_request}
-        elif any(word in request_lower for word in ['list', 'show', 'get tasks', 'tasks']):
-            return {"action": "list", "request": user_request}
-        elif any(word in request_lower for word in ['update', 'change', 'modify', 'mark']):
-            return {"action": "update", "request": user_request}
-        elif any(word in request_lower for word in ['delete', 'remove']):
-            return {"action": "delete", "request": user_request}
-        elif any(word in request_lower for word in ['statistics', 'stats', 'summary', 'overview']):
-            return {"action": "statistics", "request": user_request}
-        else:
-            return {"action": "general", "request": user_request}
-
-    def _extract_task_info(self, user_request: str) -> Dict[str, Any]:
+        actions = {self._ACTION_MAP.get(keyword) for keyword in matched}
+        actions.discard(None)
+        for action in self._ACTION_PRIORITY:
+            if action in actions:
+                return {"action": action, "request": user_request, "unambiguous": len(actions) == 1}
+        return {"action": "general", "request": user_request, "unambiguous": False}
+
+    def _local_params(self, user_request: str, action: str) -> Dict[str, Any]:
+        """Extract parameters for a locally handled action without calling Gemini"""
+        if action == "list":
+            match = self._STATUS_PATTERN.search(user_request.lower())
+            if match:
+                status = match.group(1)
+                if status.startswith("in"):
+                    status = "in_progress"
+                elif status.startswith("cancel"):
+                    status = "canceled"
+                return {"status": status}
+        return {}
+
+    def _cached_plan(self, cache_key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a previously computed plan, if any"""
+        with self._cache_lock:
+            cached = self._plan_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._plan_cache.move_to_end(cache_key)
+        return {**cached, "params": dict(cached["params"])}
+
+    def _store_plan(self, cache_key: Tuple[str, str], plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember the plan computed for a request and return a copy for the caller"""
+        with self._cache_lock:
+            self._plan_cache[cache_key] = plan
+            if len(self._plan_cache) > PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+        return {**plan, "params": dict(plan["params"])}
+
+    @staticmethod
+    def _plan_prompt(user_request: str, current_date: str) -> str:
+        """Build the prompt that classifies a request, extracts its parameters and drafts the reply"""
+        return f"""
+        Plan how to handle this task management request.
+        Current date: {current_date}
+        
+        Request: "{user_request}"
+        
+        Return JSON with keys:
+        - action: one of {", ".join(VALID_ACTIONS)}
+        - params: object with these keys, each only if it applies:
+          - title (string)
+          - description (string)
+          - priority (low, medium, high) - only if explicitly mentioned
+          - status (pending, in_progress, completed, canceled) - only if explicitly mentioned
+          - due_date (YYYY-MM-DD) - convert relative dates like 'tomorrow', 'next friday' to this format.
+          - task_id (integer) - if mentioned
+        - response_template: a short, friendly reply to the user that contains the
+          literal placeholder {RESULT_PLACEHOLDER} where the operation result will be inserted.
+          Do not assume whether the operation succeeds; the result will say so.
         """
-        Extract task information from user request using Gemini
+
+    def _build_plan(self, raw: Dict[str, Any], user_request: str) -> Dict[str, Any]:
+        """Validate the model's plan, falling back to keyword routing for unknown actions"""
+        action = raw.get("action")
+        if action not in VALID_ACTIONS:
+            action = self._parse_user_request(user_request)["action"]
+
+        params = {k: v for k, v in (raw.get("params") or {}).items() if v not in (None, "")}
+        return {
+            "action": action,
+            "params": params,
+            "response_template": raw.get("response_template") or "",
+        }
+
+    def _fallback_plan(self, user_request: str) -> Dict[str, Any]:
+        """Plan used when Gemini is unavailable: keyword routing with no parameters"""
+        return {
+            "action": self._parse_user_request(user_request)["action"],
+            "params": {},
+            "response_template": "",
+        }
+
+    def _plan_and_extract(self, user_request: str) -> Dict[str, Any]:
+        """
+        Classify the request, extract task parameters and draft the reply in one Gemini call
         Handles natural language dates (e.g., "tomorrow")
+        
+        Args:
+            user_request: User's request text
+            
+        Returns:
+            Dictionary with action, params and response_template
         """
+        cache_key, cached, prompt = self._begin_plan(user_request)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.model.generate_content(prompt, generation_config=PLAN_GENERATION_CONFIG)
+            return self._finish_plan(cache_key, response.text, user_request)
+        except Exception as e:
+            return self._plan_failed(user_request, e)
+
+    async def _aplan_and_extract(self, user_request: str) -> Dict[str, Any]:
+        """Async variant of _plan_and_extract"""
+        cache_key, cached, prompt = self._begin_plan(user_request)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.model.generate_content_async(prompt, generation_config=PLAN_GENERATION_CONFIG)
+            return self._finish_plan(cache_key, response.text, user_request)
+        except Exception as e:
+            return self._plan_failed(user_request, e)
+
+    def _begin_plan(self, user_request: str) -> Tuple[Tuple[str, str], Optional[Dict[str, Any]], str]:
+        """Return the plan cache key, the cached plan if any, and the planning prompt"""
         current_date = datetime.now().strftime("%Y-%m-%d")
+
+        # Relative dates depend on the current date, so it is part of the key
+        cache_key = (current_date, self._normalize_request(user_request))
+        return cache_key, self._cached_plan(cache_key), self._plan_prompt(user_request, current_date)
+
+    def _finish_plan(self, cache_key: Tuple[str, str], response_text: str, user_request: str) -> Dict[str, Any]:
+        """Validate and cache the plan returned by Gemini"""
+        return self._store_plan(cache_key, self._build_plan(orjson.loads(response_text), user_request))
+
+    def _plan_failed(self, user_request: str, error: Exception) -> Dict[str, Any]:
+        """Log a failed planning call and fall back to keyword routing"""
+        log_agent_event("plan_extraction_failed", "google_adk_agent", {"error": str(error)})
+        return self._fallback_plan(user_request)
+
+    @staticmethod
+    def _split_template(template: str) -> Tuple[str, str]:
+        """Split the planned reply into the text before and after the operation result"""
+        if not template:
+            return "", ""
+        if RESULT_PLACEHOLDER not in template:
+            return f"{template}\n\n", ""
+        prefix, suffix = template.split(RESULT_PLACEHOLDER, 1)
+        return prefix, suffix.replace(RESULT_PLACEHOLDER, "")
+
+    def _embed_tasks(self, tasks: List[Dict[str, Any]]) -> np.ndarray:
+        """Return one normalized embedding row per task, re-embedding only new or edited tasks"""
+        texts = [f"{title}\n{description or ''}".strip() for title, description in map(_dedup_fields, tasks)]
+        missing = [
+            i for i, (task, text) in enumerate(zip(tasks, texts))
+            if self._task_embeddings.get(task["id"], ("",))[0] != text
+        ]
+        if missing:
+            result = self._genai.embed_content(model=EMBEDDING_MODEL, content=[texts[i] for i in missing])
+            for i, vector in zip(missing, result["embedding"]):
+                vector = np.asarray(vector, dtype=np.float32)
+                self._task_embeddings[tasks[i]["id"]] = (texts[i], vector / (np.linalg.norm(vector) or 1.0))
+
+        # Forget tasks that are gone
+        self._task_embeddings = {t["id"]: self._task_embeddings[t["id"]] for t in tasks}
+        return np.stack([self._task_embeddings[t["id"]][1] for t in tasks])
+
+    def _confirm_duplicate(self, task_a: Dict[str, Any], task_b: Dict[str, Any]) -> bool:
+        """Ask Gemini whether two borderline-similar tasks are duplicates"""
         prompt = f"""
-        Extract task details from this request into a JSON object.
-        Current date: {current_date}
-        
-        Request: "{user_request}"
+        Are these two tasks duplicates based on semantic meaning?
+        Example: "Finish course" and "Get course certificate" are duplicates.
         
-        Return JSON with keys:
-        - title (string)
-        - priority (low, medium, high) - only if explicitly mentioned
-        - status (pending, in_progress, completed) - only if explicitly mentioned
-        - due_date (YYYY-MM-DD) - convert relative dates like 'tomorrow', 'next friday' to this format.
-        - task_id (integer) - if mentioned
+        Task A: {task_a['title']} - {task_a.get('description') or ''}
+        Task B: {task_b['title']} - {task_b.get('description') or ''}
         
-        Respond ONLY with the JSON string.
+        Response format (JSON only):
+        {{"duplicate": true}} or {{"duplicate": false}}
         """
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.replace("```json", "").replace("```", "").strip()
-            return json.loads(text)
+            response = self.model.generate_content(prompt, generation_config=DUPLICATE_GENERATION_CONFIG)
+            return bool(orjson.loads(response.text).get("duplicate"))
         except Exception:
-            return {}
+            return False
+
+    @staticmethod
+    def _find_root(parent: List[int], i: int) -> int:
+        """Union-find lookup with path halving"""
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _split_exact_duplicates(
+        self, tasks: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """Separate tasks whose normalized titles repeat an older task's title"""
+        titles = [self._normalize_request(t["title"]) for t in tasks]
+        hashes = np.fromiter((hash(title) & 0xFFFFFFFFFFFFFFFF for title in titles), dtype=np.uint64, count=len(tasks))
+        ids = np.fromiter(map(_task_id, tasks), dtype=np.int64, count=len(tasks))
+        by_id = {t["id"]: (t, title) for t, title in zip(tasks, titles)}
+
+        unique_tasks, exact_duplicates = [], []
+        for task, title, keep_id in zip(tasks, titles, find_duplicates(hashes, ids).tolist()):
+            keep_task, keep_title = by_id[keep_id]
+            # Compare the titles too so a hash collision can't remove a task
+            if keep_task is task or keep_title != title:
+                unique_tasks.append(task)
+            else:
+                exact_duplicates.append((task, keep_task))
+        return unique_tasks, exact_duplicates
 
     def _deduplicate_tasks(self) -> str:
-        """Find and remove duplicate tasks using LLM"""
+        """Find and remove duplicate tasks by clustering task embeddings"""
         tasks = self.task_tools.list_tasks()
         active_tasks = [t for t in tasks if t['status'] != 'canceled']
         
         if len(active_tasks) < 2:
             return "Not enough tasks to check for duplicates."
-            
-        task_list_data = [{k: v for k, v in t.items() if k in ['id', 'title', 'description']} for t in active_tasks]
-        task_list_str = json.dumps(task_list_data, indent=2)
-        
-        prompt = f"""
-        Analyze this list of tasks and identify duplicates based on semantic meaning.
-        Example: "Finish course" and "Get course certificate" are duplicates.
-        
-        Tasks:
-        {task_list_str}
-        
-        Return a JSON object where keys are the IDs of tasks to KEEP, and values are lists of IDs of duplicate tasks to REMOVE.
-        Prefer keeping the task with the lower ID (older).
-        If no duplicates, return {{}}.
-        
-        Response format (JSON only):
-        {{
-            "keep_id": [remove_id1, remove_id2]
-        }}
-        """
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.replace("```json", "").replace("```", "").strip()
-            if "{" in text: text = text[text.find("{"):text.rfind("}")+1]
-            duplicates_map = json.loads(text)
-            
+            # Identical titles are duplicates without embedding or asking Gemini
+            unique_tasks, exact_duplicates = self._split_exact_duplicates(active_tasks)
+
+            # Cluster similar pairs; only borderline pairs cost an LLM call
+            parent = list(range(len(unique_tasks)))
+            if len(unique_tasks) >= 2:
+                embeddings = self._embed_tasks(unique_tasks)
+                similarity = embeddings @ embeddings.T
+                rows, cols = np.triu_indices(len(unique_tasks), k=1)
+                for i, j, score in zip(rows.tolist(), cols.tolist(), similarity[rows, cols].tolist()):
+                    if score < BORDERLINE_THRESHOLD:
+                        continue
+                    root_i, root_j = self._find_root(parent, i), self._find_root(parent, j)
+                    if root_i == root_j:
+                        continue
+                    if score >= DUPLICATE_THRESHOLD or self._confirm_duplicate(unique_tasks[i], unique_tasks[j]):
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+            clusters: Dict[int, List[Dict[str, Any]]] = {}
+            root_by_id = {}
+            for i, task in enumerate(unique_tasks):
+                root_by_id[task["id"]] = root = self._find_root(parent, i)
+                clusters.setdefault(root, []).append(task)
+            for task, keep_task in exact_duplicates:
+                clusters[root_by_id[keep_task["id"]]].append(task)
+
+            # Keep the oldest task of each cluster
             removed_count = 0
             report = []
-            for keep_id, remove_ids in duplicates_map.items():
-                keep_task = self.task_tools.get_task(int(keep_id))
-                for r_id in remove_ids:
-                    r_task = self.task_tools.get_task(int(r_id))
-                    if r_task and keep_task:
-                        self.task_tools.delete_task(int(r_id))
+            for members in clusters.values():
+                keep_task = min(members, key=_task_id)
+                for r_task in members:
+                    if r_task is not keep_task:
+                        self.task_tools.delete_task(r_task["id"])
                         report.append(f"Removed '{r_task['title']}' (duplicate of '{keep_task['title']}')")
                         removed_count += 1
             if removed_count > 0:
@@ -178,87 +588,87 @@ Always provide clear, helpful responses."""
         Returns:
             Result of the action
         """
-        try:
-            if action == "create":
-                title = params.get("title", "Untitled Task")
-                description = params.get("description", "")
-                priority = params.get("priority", "medium")
-                due_date = params.get("due_date")
+        # aprocess_request runs actions on worker threads and Streamlit sessions share one
+        # agent, so actions are serialized to keep the task store consistent
+        with self._execute_lock:
+            try:
+                if action == "create":
+                    title = params.get("title", "Untitled Task")
+                    description = params.get("description", "")
+                    priority = params.get("priority", "medium")
+                    due_date = params.get("due_date")
                 
-                # Auto-set high priority if due date is near (within 24 hours)
-                if due_date:
-                    try:
-                        due_dt = datetime.strptime(due_date, "%Y-%m-%d")
-                        if 0 <= (due_dt - datetime.now()).days < 1:
-                            priority = "high"
-                    except ValueError:
-                        pass
+                    # Auto-set high priority if due date is near (today or tomorrow)
+                    if due_date:
+                        try:
+                            if 0 <= (date.fromisoformat(due_date) - date.today()).days <= 1:
+                                priority = "high"
+                        except ValueError:
+                            pass
                 
-                task = self.task_tools.create_task(title, description, priority, due_date)
-                return f"Task created successfully!\nID: {task['id']}\nTitle: {task['title']}\nPriority: {task['priority']}\nStatus: {task['status']}"
+                    task = self.task_tools.create_task(title, description, priority, due_date)
+                    return f"Task created successfully!\nID: {task['id']}\nTitle: {task['title']}\nPriority: {task['priority']}\nStatus: {task['status']}"
             
-            elif action == "list":
-                status = params.get("status")
-                tasks = self.task_tools.list_tasks(status)
+                elif action == "list":
+                    status = params.get("status")
+                    tasks = self.task_tools.list_tasks(status)
                 
-                if not tasks:
-                    return "No tasks found."
+                    if not tasks:
+                        return "No tasks found."
                 
-                result = f"Found {len(tasks)} task(s):\n\n"
-                for task in tasks:
-                    result += f"• ID {task['id']}: {task['title']} ({task['status']}, {task['priority']} priority)\n"
-                    if task.get('due_date'):
-                        result += f"  Due: {task['due_date']}\n"
-                    if task.get('description'):
-                        result += f"  Description: {task['description']}\n"
-                    result += "\n"
+                    result = f"Found {len(tasks)} task(s):\n\n"
+                    for task in tasks:
+                        result += f"• ID {task['id']}: {task['title']} ({task['status']}, {task['priority']} priority)\n"
+                        if task.get('due_date'):
+                            result += f"  Due: {task['due_date']}\n"
+                        if task.get('description'):
+                            result += f"  Description: {task['description']}\n"
+                        result += "\n"
                 
-                return result
+                    return result
             
-            elif action == "update":
-                task_id = params.get("task_id")
-                title = params.get("title")
-
-                # Find task by ID or title
-                task = None
-                if task_id:
-                    task = self.task_tools.get_task(task_id)
-                elif title:
-                    all_tasks = self.task_tools.list_tasks()
-                    task = next((t for t in all_tasks if t["title"].lower() == title.lower()), None)
-
-                if not task:
-                    return "Task not found. Please check the ID or title."
-
-                updated_task = self.task_tools.update_task(
-                    task_id=task["id"],
-                    status=params.get("status"),
-                    priority=params.get("priority"),
-                    title=params.get("title"),
-                )
-
-                return f"Task {updated_task['id']} updated successfully!\nTitle: {updated_task['title']}\nStatus: {updated_task['status']}\nPriority: {updated_task['priority']}"
-
-            elif action == "delete":
-                task_id = params.get("task_id")
-                title = params.get("title")
-
-                task = None
-                if task_id:
-                    task = self.task_tools.get_task(task_id)
-                elif title:
-                    all_tasks = self.task_tools.list_tasks()
-                    task = next((t for t in all_tasks if t["title"].lower() == title.lower()), None)
-
-                if not task:
-                    return "Task not found. Please check the ID or title."
-
-                self.task_tools.delete_task(task["id"])
-                return f"Task {task['id']} deleted successfully!"
-
-            elif action == "statistics":
-                stats = self.task_tools.get_statistics()
-                return f"""Task Statistics:
+                elif action == "update":
+                    task_id = params.get("task_id")
+                    title = params.get("title")
+
+                    # Find task by ID or title
+                    task = None
+                    if task_id:
+                        task = self.task_tools.get_task(task_id)
+                    elif title:
+                        task = self.task_tools.get_by_title_lower(title.lower())
+
+                    if not task:
+                        return "Task not found. Please check the ID or title."
+
+                    updated_task = self.task_tools.update_task(
+                        task_id=task["id"],
+                        status=params.get("status"),
+                        priority=params.get("priority"),
+                        title=params.get("title"),
+                    )
+
+                    return f"Task {updated_task['id']} updated successfully!\nTitle: {updated_task['title']}\nStatus: {updated_task['status']}\nPriority: {updated_task['priority']}"
+
+                elif action == "delete":
+                    task_id = params.get("task_id")
+                    title = params.get("title")
+
+                    task = None
+                    if task_id:
+                        task = self.task_tools.get_task(task_id)
+                    elif title:
+                        task = self.task_tools.get_by_title_lower(title.lower())
+
+                    if not task:
+                        return "Task not found. Please check the ID or title."
+
+                    self.task_tools.delete_task(task["id"])
+                    return f"Task {task['id']} deleted successfully!"
+
+                elif action == "statistics":
+                    stats = self.task_tools.get_statistics()
+                    return f"""Task Statistics:
 • Total Tasks: {stats['total']}
 • Pending: {stats['pending']}
 • In Progress: {stats['in_progress']}
@@ -267,15 +677,15 @@ Always provide clear, helpful responses."""
 • Medium Priority: {stats['medium_priority']}
 • Low Priority: {stats['low_priority']}"""
 
-            elif action == "deduplicate":
-                return self._deduplicate_tasks()
+                elif action == "deduplicate":
+                    return self._deduplicate_tasks()
 
-            else:
-                return "I understand your request, but I'm not sure how to handle it. Try:\n- Creating a task\n- Listing tasks\n- Updating a task\n- Deleting a task\n- Getting statistics"
+                else:
+                    return "I understand your request, but I'm not sure how to handle it. Try:\n- Creating a task\n- Listing tasks\n- Updating a task\n- Deleting a task\n- Getting statistics"
 
-        except Exception as e:
-            log_agent_event("action_execution_failed", "google_adk_agent", {"action": action, "error": str(e)})
-            return f"Error executing action: {str(e)}"
+            except Exception as e:
+                log_agent_event("action_execution_failed", "google_adk_agent", {"action": action, "error": str(e)})
+                return f"Error executing action: {str(e)}"
 
     def process_request(self, user_request: str) -> str:
         """
@@ -287,6 +697,74 @@ Always provide clear, helpful responses."""
         Returns:
             Response from the agent
         """
+        return "".join(self.process_request_stream(user_request))
+
+    def process_request_stream(self, user_request: str) -> Iterator[str]:
+        """
+        Process a user request, yielding the response in pieces as they become available
+        The reply's lead-in is yielded as soon as the plan is known, before the action runs
+        
+        Args:
+            user_request: The user's task management request
+            
+        Yields:
+            Consecutive pieces of the response from the agent
+        """
+        steps = self._request_steps(user_request)
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration:
+                return
+            kind = step[0]
+            reply = None
+            if kind == "output":
+                yield step[1]
+            elif kind == "embed":
+                reply = self._embed(step[1])
+            elif kind == "plan":
+                reply = self._plan_and_extract(step[1])
+            else:
+                reply = self._execute_action(step[1], step[2])
+
+    async def aprocess_request(self, user_request: str) -> str:
+        """
+        Async variant of process_request using the non-blocking Gemini client
+        Actions run in a worker thread, since deduplication makes blocking Gemini calls
+        
+        Args:
+            user_request: The user's task management request
+            
+        Returns:
+            Response from the agent
+        """
+        steps = self._request_steps(user_request)
+        pieces = []
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration:
+                return "".join(pieces)
+            kind = step[0]
+            reply = None
+            if kind == "output":
+                pieces.append(step[1])
+            elif kind == "embed":
+                reply = await self._aembed(step[1])
+            elif kind == "plan":
+                reply = await self._aplan_and_extract(step[1])
+            else:
+                reply = await asyncio.to_thread(self._execute_action, step[1], step[2])
+
+    def _request_steps(self, user_request: str) -> Generator[Tuple[Any, ...], Any, None]:
+        """
+        Request pipeline shared by the sync and async entry points, which perform its I/O
+        
+        Yields ("embed", text), ("plan", user_request) and ("execute", action, params) steps,
+        each resumed with its result, and ("output", text) pieces of the response.
+        """
         from observability.langfuse_config import create_trace, end_span
         trace = create_trace(
             name="google_adk_task_processing",
@@ -296,38 +774,81 @@ Always provide clear, helpful responses."""
         try:
             log_agent_event("task_processing_started", "google_adk_agent", {"request": user_request})
             
-            # Parse the request
+            # Route locally first to decide whether Gemini or the cache are needed at all
             parsed = self._parse_user_request(user_request)
             action = parsed["action"]
-            
-            # Extract parameters
-            params = {}
-            if action in ["create", "update", "delete"]:
-                params = self._extract_task_info(user_request)
-            
-            # Execute the action
-            result = self._execute_action(action, params)
-            
-            # Generate a friendly response (optional)
-            response_prompt = f"""Based on the task management operation result below, provide a friendly, natural response to the user.
 
-Operation Result:
-{result}
+            # Unambiguous list/statistics/deduplicate requests are answered directly
+            if parsed["unambiguous"] and action in LOCAL_ACTIONS:
+                result = yield ("execute", action, self._local_params(user_request, action))
+                end_span(output=result)
+                log_agent_event("task_processing_completed", "google_adk_agent", {"request": user_request, "success": True, "local": True})
+                yield ("output", result)
+                return
 
-User's Original Request:
-{user_request}
+            # Serve repeated read-only requests from the response cache
+            cache_key = self._normalize_request(user_request)
+            cached = self._match_exact(cache_key)
+            query_embedding = None
+            if cached is None and action in SEMANTIC_CACHE_ACTIONS:
+                query_embedding = yield ("embed", cache_key)
+                cached = self._match_semantic(query_embedding)
+            if cached is not None:
+                end_span(output=cached)
+                log_agent_event("task_processing_completed", "google_adk_agent", {"request": user_request, "success": True, "cache_hit": True})
+                yield ("output", cached)
+                return
+            
+            # Classify, extract parameters and draft the reply in one call
+            plan = yield ("plan", user_request)
+            action = plan["action"]
+            prefix, suffix = self._split_template(plan["response_template"])
+            if prefix:
+                yield ("output", prefix)
+            
+            # Execute the action; a result computed while another request mutates the
+            # store must not be cached under the newer revision
+            revision = self.task_tools.revision()
+            result = yield ("execute", action, plan["params"])
+            yield ("output", result)
+            if suffix:
+                yield ("output", suffix)
+            final_result = f"{prefix}{result}{suffix}"
 
-Provide a concise, helpful response."""
-            response = self.model.generate_content(response_prompt)
-            final_result = response.text
+            if action in CACHEABLE_ACTIONS:
+                if action not in SEMANTIC_CACHE_ACTIONS:
+                    query_embedding = None
+                elif query_embedding is None:
+                    query_embedding = yield ("embed", cache_key)
+                self._cache_response(cache_key, final_result, query_embedding, revision)
             
             end_span(output=final_result)
             log_agent_event("task_processing_completed", "google_adk_agent", {"request": user_request, "success": True})
-            
-            return final_result
         
         except Exception as e:
             error_msg = f"I encountered an error: {str(e)}"
             end_span(output=error_msg)
             log_agent_event("task_processing_failed", "google_adk_agent", {"error": str(e)})
-            return error_msg
+            yield ("output", error_msg)
+
+    async def run_batch_async(self, prompts: List[str]) -> List[str]:
+        """
+        Process several requests concurrently
+        
+        Args:
+            prompts: User requests to process
+            
+        Returns:
+            Responses in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def run_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.aprocess_request(prompt)
+
+        return list(await asyncio.gather(*(run_one(p) for p in prompts)))
+
+    def run_batch(self, prompts: List[str]) -> List[str]:
+        """Blocking wrapper around run_batch_async"""
+        return asyncio.run(self.run_batch_async(prompts))
@@ -0,0 +1,44 @@
+"""
+Cosine similarity lookup for the semantic response cache
+Uses a Numba-compiled kernel when numba is installed, NumPy otherwise
+"""
+import numpy as np
+
+# Resolved on the first lookup so numba is only imported when the cache is used
+_kernel = None
+
+
+def _topk_cosine_numpy(mat: np.ndarray, q: np.ndarray, thresh: float) -> int:
+    """Return the index of the row most similar to q, or -1 if below thresh"""
+    if mat.shape[0] == 0:
+        return -1
+    scores = mat @ q
+    best = int(np.argmax(scores))
+    return best if scores[best] >= thresh else -1
+
+
+def _load_kernel():
+    """Return the Numba kernel, or the NumPy fallback if numba is not installed"""
+    try:
+        from agents._cosine_kernel import topk_cosine_numba
+    except ImportError:
+        return _topk_cosine_numpy
+    return topk_cosine_numba
+
+
+def topk_cosine(mat: np.ndarray, q: np.ndarray, thresh: float) -> int:
+    """
+    Find the cached embedding most similar to a query
+
+    Args:
+        mat: C-contiguous float32 matrix of L2-normalized embeddings, one per row
+        q: L2-normalized float32 query embedding
+        thresh: Minimum cosine similarity for a match
+
+    Returns:
+        Row index of the best match, or -1 if no row reaches thresh
+    """
+    global _kernel
+    if _kernel is None:
+        _kernel = _load_kernel()
+    return int(_kernel(mat, q, np.float32(thresh)))
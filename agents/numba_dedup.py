@@ -0,0 +1,43 @@
+"""
+Exact-duplicate detection over hashed task titles
+Uses a Numba-compiled kernel when numba is installed, NumPy otherwise
+"""
+import numpy as np
+
+# Resolved on the first call so numba is only imported when deduplication runs
+_kernel = None
+
+
+def _find_duplicates_numpy(hashes: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Return, for each row, the lowest ID among rows sharing its hash"""
+    _, inverse = np.unique(hashes, return_inverse=True)
+    keep = np.full(inverse.max(initial=-1) + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(keep, inverse, ids)
+    return keep[inverse]
+
+
+def _load_kernel():
+    """Return the Numba kernel, or the NumPy fallback if numba is not installed"""
+    try:
+        from agents._dedup_kernel import find_duplicates_numba
+    except ImportError:
+        return _find_duplicates_numpy
+    return find_duplicates_numba
+
+
+def find_duplicates(hashes: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Group tasks whose title hashes are equal
+
+    Args:
+        hashes: uint64 title hash per task
+        ids: int64 task ID per task, aligned with hashes
+
+    Returns:
+        int64 array holding, for each task, the lowest task ID sharing its hash;
+        a task is an exact duplicate when this differs from its own ID
+    """
+    global _kernel
+    if _kernel is None:
+        _kernel = _load_kernel()
+    return _kernel(hashes, ids)
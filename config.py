@@ -0,0 +1,36 @@
+"""
+Environment Configuration
+Reads environment variables once and exposes them as an immutable config
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(frozen=True, slots=True)
+class EnvConfig:
+    """Settings read from the environment / .env file"""
+    gemini_key: Optional[str]
+    notion_db_id: Optional[str]
+    notion_secret: Optional[str]
+    # TASK_DEBUG=1 also logs read-only task lookups
+    task_debug: bool
+    # Append-only task log replayed at startup; None keeps tasks in memory only
+    tasks_log_path: Optional[str]
+
+
+@lru_cache(maxsize=None)
+def env() -> EnvConfig:
+    """Return the process-wide configuration, reading the environment on first call"""
+    return EnvConfig(
+        gemini_key=os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"),
+        notion_db_id=os.getenv("NOTION_DATABASE_ID"),
+        notion_secret=os.getenv("NOTION_INTERNAL_SECRET"),
+        task_debug=os.getenv("TASK_DEBUG") == "1",
+        tasks_log_path=os.getenv("TASKS_LOG_PATH", "tasks.jsonl") or None,
+    )
@@ -15,31 +15,47 @@ from observability.langfuse_config import (
 
 load_dotenv()
 
+_BANNER = "\n".join([
+    "=" * 60,
+    " AI Agent System - CLI Test Mode",
+    "=" * 60,
+    "Integrated with:",
+    "  • Google ADK (Gemini)",
+    "  • Serper (Web Search)",
+    "  • Langfuse Observability",
+    "=" * 60,
+    "",
+    "",
+])
+
+_INTERACTIVE_HEADER = "\n".join([
+    "",
+    "=" * 60,
+    " Google ADK Agent - Interactive Mode",
+    " Type 'exit' to quit",
+    "=" * 60,
+    "",
+    "",
+])
+
 
 def print_banner():
-    print("=" * 60)
-    print(" AI Agent System - CLI Test Mode")
-    print("=" * 60)
-    print("Integrated with:")
-    print("  • Google ADK (Gemini)")
-    print("  • Serper (Web Search)")
-    print("  • Langfuse Observability")
-    print("=" * 60)
-    print()
+    sys.stdout.write(_BANNER)
 
 
-def check_environment():
-    required_vars = [
-        "GEMINI_API_KEY",
-        "LANGFUSE_PUBLIC_KEY",
-        "LANGFUSE_SECRET_KEY",
-    ]
+REQUIRED_ENV_VARS = frozenset({
+    "GEMINI_API_KEY",
+    "LANGFUSE_PUBLIC_KEY",
+    "LANGFUSE_SECRET_KEY",
+})
 
-    missing = [var for var in required_vars if not os.getenv(var)]
+
+def check_environment():
+    missing = REQUIRED_ENV_VARS - os.environ.keys()
 
     if missing:
         print("❌ Missing required environment variables:")
-        for var in missing:
+        for var in sorted(missing):
             print(f"  - {var}")
         print("\nPlease add them to your .env file.")
         return False
@@ -48,10 +64,7 @@ def check_environment():
 
 
 def run_interactive_mode():
-    print("\n" + "=" * 60)
-    print(" Google ADK Agent - Interactive Mode")
-    print(" Type 'exit' to quit")
-    print("=" * 60 + "\n")
+    sys.stdout.write(_INTERACTIVE_HEADER)
 
     try:
         agent = GoogleADKAgent()
@@ -78,8 +91,14 @@ def run_interactive_mode():
             )
 
             print("\n⏳ Processing...\n")
+            print("🤖 Agent Response:")
 
-            response = agent.process_request(user_input)
+            chunks = []
+            for chunk in agent.process_request_stream(user_input):
+                print(chunk, end="", flush=True)
+                chunks.append(chunk)
+            print("\n")
+            response = "".join(chunks)
 
             log_agent_event(
                 "agent_response",
@@ -87,8 +106,6 @@ def run_interactive_mode():
                 {"response": response}
             )
 
-            print(f"🤖 Agent Response:\n{response}\n")
-
         except KeyboardInterrupt:
             print("\n\n👋 Interrupted by user")
             log_agent_event("application_exit", "main", {"status": "keyboard_interrupt"})
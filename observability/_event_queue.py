@@ -0,0 +1,75 @@
+"""
+Background Event Delivery
+Queues observability events so callers never wait on Langfuse
+"""
+import atexit
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+
+# Events beyond this backlog are dropped rather than blocking the caller
+MAX_QUEUED_EVENTS = 10_000
+
+Event = Tuple[str, str, dict]
+
+_STOP = object()
+
+
+class EventQueue:
+    """Bounded event queue drained by a daemon worker thread"""
+
+    def __init__(self, emit: Callable[[str, str, dict], None]):
+        """
+        Args:
+            emit: Function that delivers one (event_name, agent_name, data) event
+        """
+        self._emit = emit
+        self._queue = queue.Queue(maxsize=MAX_QUEUED_EVENTS)
+        self.dropped = 0
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def put(self, event: Event):
+        """Queue an event for delivery, starting the worker on first use; never blocks"""
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Observability is best effort; a stalled backend must not stall requests
+            self.dropped += 1
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="observability-events", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        # Langfuse has no batch event API, so each event is sent as soon as it is dequeued
+        while True:
+            event = self._queue.get()
+            if event is _STOP:
+                return
+            try:
+                self._emit(*event)
+            except Exception:
+                # Events are not critical for core functionality
+                pass
+
+    def drain_and_join(self, timeout: float = 5.0):
+        """Deliver queued events and stop the worker"""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return
+            worker.join(timeout)
+
+
+def create_event_queue(emit: Callable[[str, str, dict], None]) -> EventQueue:
+    """Create an event queue that is drained when the interpreter exits"""
+    event_queue = EventQueue(emit)
+    atexit.register(event_queue.drain_and_join)
+    return event_queue
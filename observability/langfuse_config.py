@@ -7,6 +7,8 @@ import warnings
 from langfuse import Langfuse
 from dotenv import load_dotenv
 
+from observability._event_queue import create_event_queue
+
 # Suppress Langfuse context warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="langfuse")
 
@@ -93,28 +95,31 @@ def trace_agent_execution(agent_name: str, task: str, result: str = None, metada
         # Return None if trace creation fails
         return None
 
+def _emit_event(event_name: str, agent_name: str, data: dict):
+    """Send one event to Langfuse (runs on the event queue's worker thread)"""
+    langfuse.create_event(
+        name=event_name,
+        metadata={
+            "agent": agent_name,
+            **data
+        }
+    )
+
+# Events are delivered in the background so logging never blocks a request
+event_queue = create_event_queue(_emit_event)
+
 def log_agent_event(event_name: str, agent_name: str, data: dict):
     """
     Log a custom event for agent observability
+    The event is queued and sent to Langfuse by a background thread,
+    or dropped if the queue is full
     
     Args:
         event_name: Name of the event
         agent_name: Name of the agent
         data: Event data
     """
-    try:
-        # Use create_event method
-        langfuse.create_event(
-            name=event_name,
-            metadata={
-                "agent": agent_name,
-                **data
-            }
-        )
-    except Exception as e:
-        # Silently fail to not break the application
-        # Events are not critical for core functionality
-        pass
+    event_queue.put((event_name, agent_name, data))
 
 def create_span(name: str, metadata: dict = None):
     """Create a span"""
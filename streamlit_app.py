@@ -1,10 +1,28 @@
 # streamlit_app.py
+import time
 import streamlit as st
 from datetime import datetime
 from agents.google_adk_agent import GoogleADKAgent
+from tools.task_tools import PRIORITIES, STATUSES
 
-# Initialize agent
-agent = GoogleADKAgent()
+# Select box positions, so defaults are dict lookups instead of list.index() scans
+PRIORITY_INDEX = {p: i for i, p in enumerate(PRIORITIES)}
+STATUS_INDEX = {s: i for i, s in enumerate(STATUSES)}
+
+# Board filter label -> status, in STATUSES order
+STATUS_BY_LABEL = {
+    "Pending": "pending",
+    "In Progress": "in_progress",
+    "Completed": "completed",
+    "Canceled": "canceled",
+}
+
+# Initialize agent once per server process so its response cache survives reruns
+@st.cache_resource
+def get_agent() -> GoogleADKAgent:
+    return GoogleADKAgent()
+
+agent = get_agent()
 
 st.title("AI Task Manager")
 
@@ -29,15 +47,16 @@ if prompt := st.chat_input("Ask to create, list, or update tasks..."):
         st.markdown(response)
 
 # Auto-update priorities based on due date (Logic: if due < 24h, set high)
-all_tasks_check = agent.task_tools.list_tasks()
-for t in all_tasks_check:
-    if t.get("due_date") and t.get("status") not in ["completed", "canceled"]:
-        try:
-            due_dt = datetime.strptime(t["due_date"], "%Y-%m-%d")
-            if (due_dt - datetime.now()).days < 1 and t.get("priority") != "high":
+# Runs at most once per PRIORITY_CHECK_INTERVAL seconds instead of on every rerun
+PRIORITY_CHECK_INTERVAL = 60
+if time.time() - st.session_state.get("_last_prio_check", 0) > PRIORITY_CHECK_INTERVAL:
+    st.session_state["_last_prio_check"] = time.time()
+    now = datetime.now()
+    for t in agent.task_tools.list_tasks():
+        due_dt = t.get("_due_dt")
+        if due_dt and t.get("status") not in ("completed", "canceled"):
+            if (due_dt - now).days < 1 and t.get("priority") != "high":
                 agent.task_tools.update_task(t["id"], priority="high")
-        except ValueError:
-            pass
 
 # Session State for Editing
 if "edit_task_id" not in st.session_state:
@@ -52,8 +71,8 @@ if st.session_state.edit_task_id:
         with st.sidebar.form("edit_task_form"):
             e_title = st.text_input("Task Title", value=task_to_edit['title'])
             
-            p_index = ["low", "medium", "high"].index(task_to_edit['priority']) if task_to_edit['priority'] in ["low", "medium", "high"] else 1
-            e_priority = st.selectbox("Priority", ["low", "medium", "high"], index=p_index)
+            p_index = PRIORITY_INDEX.get(task_to_edit['priority'], PRIORITY_INDEX["medium"])
+            e_priority = st.selectbox("Priority", PRIORITIES, index=p_index)
             
             # Date handling
             has_date = bool(task_to_edit['due_date'])
@@ -61,19 +80,19 @@ if st.session_state.edit_task_id:
             e_due_date_val = None
             if e_has_due_date:
                 default_d = datetime.now().date()
-                if has_date:
-                    try:
-                        default_d = datetime.strptime(task_to_edit['due_date'], "%Y-%m-%d").date()
-                    except: pass
+                if task_to_edit.get('_due_dt'):
+                    default_d = task_to_edit['_due_dt'].date()
                 e_due_date_val = st.date_input("Due Date", value=default_d)
             
-            s_index = ["pending", "in_progress", "completed", "canceled"].index(task_to_edit.get('status', 'pending'))
-            e_status = st.selectbox("Status", ["pending", "in_progress", "completed", "canceled"], index=s_index)
+            s_index = STATUS_INDEX.get(task_to_edit.get('status', 'pending'), STATUS_INDEX["pending"])
+            e_status = st.selectbox("Status", STATUSES, index=s_index)
             
             if st.form_submit_button("Save Changes"):
                 d_str = str(e_due_date_val) if e_has_due_date and e_due_date_val else None
                 agent.task_tools.update_task(task_to_edit['id'], title=e_title, priority=e_priority, status=e_status, due_date=d_str)
                 st.session_state.edit_task_id = None
+                # Re-check priorities now that the due date may have changed
+                st.session_state["_last_prio_check"] = 0
                 st.rerun()
                 
         if st.sidebar.button("Cancel Edit"):
@@ -86,7 +105,7 @@ else:
     st.sidebar.header("Create a Task")
     with st.sidebar.form("create_task_form"):
         title = st.text_input("Task Title")
-        priority = st.selectbox("Priority", ["low", "medium", "high"], index=1)
+        priority = st.selectbox("Priority", PRIORITIES, index=PRIORITY_INDEX["medium"])
         
         # Due Date Selection
         has_due_date = st.checkbox("Set Due Date", value=True)
@@ -94,7 +113,7 @@ else:
         if has_due_date:
             due_date_val = st.date_input("Due Date")
             
-        status = st.selectbox("Initial Status", ["pending", "in_progress", "completed"])
+        status = st.selectbox("Initial Status", STATUSES[:-1])  # all but "canceled"
         submit = st.form_submit_button("Create Task")
         if submit:
             command = f'Create Task "{title}" with {priority} priority'
@@ -110,72 +129,38 @@ if st.sidebar.button("Remove Duplicates"):
     with st.spinner("Analyzing tasks..."):
         st.sidebar.success(agent.process_request("remove duplicate tasks"))
 
-# List all tasks
-st.header("Task Board")
-
-# Filter
-filter_option = st.radio("Filter:", ["All Tasks", "Pending", "In Progress", "Completed", "Canceled"], horizontal=True)
-
-# Get tasks directly from tools for custom rendering
-tasks = agent.task_tools.list_tasks()
+OVERDUE_HTML = "<div style='color: #ff4b4b; font-size: 0.9em; margin-top: 5px;'>⚠️ Overdue</div>"
 
-# Apply Filter
-if filter_option != "All Tasks":
-    status_map = {
-        "Pending": "pending",
-        "In Progress": "in_progress",
-        "Completed": "completed",
-        "Canceled": "canceled"
-    }
-    tasks = [t for t in tasks if t.get("status") == status_map[filter_option]]
+# Border Color by Status (default grey for pending) and Priority Icon (default blue for low)
+STATUS_BORDER = {"in_progress": "#2196f3", "completed": "#4caf50", "canceled": "#ef5350"}
+PRIORITY_ICON = {"medium": "🟢", "high": "🔴"}
 
-# Always Sort by Priority
-priority_map = {"high": 3, "medium": 2, "low": 1}
-tasks.sort(key=lambda x: priority_map.get(x.get("priority", "medium"), 0), reverse=True)
-
-for task in tasks:
+def render_card(task: dict, now: datetime) -> str:
+    """Build the HTML for one task card"""
     p = task.get("priority", "medium")
     d = task.get("due_date")
     s = task.get("status", "pending")
-    
-    # Determine Border Color based on Status
-    border_color = "#9e9e9e" # Default Grey (Pending)
-    if s == "in_progress":
-        border_color = "#2196f3" # Blue
-    elif s == "completed":
-        border_color = "#4caf50" # Green
-    elif s == "canceled":
-        border_color = "#ef5350" # Red/Grey mix
-        
-    # Determine Priority Icon
-    p_icon = "🔵" # Low
-    if p == "medium": p_icon = "🟢"
-    if p == "high": p_icon = "🔴"
-        
+
     # Timer Logic
     timer_html = ""
-    if d and s not in ["completed", "canceled"]:
-        try:
-            due_dt = datetime.strptime(d, "%Y-%m-%d")
-            delta = due_dt - datetime.now()
-            total_seconds = delta.total_seconds()
-            
-            if total_seconds > 0:
-                days = delta.days
-                hours = delta.seconds // 3600
-                minutes = (delta.seconds % 3600) // 60
-                t_color = "#ff4b4b" if total_seconds < 3600 else "#666"
-                timer_html = f"<div style='color: {t_color}; font-size: 0.9em; margin-top: 5px;'>⏳ Time left: {days}d {hours}h {minutes}m</div>"
-            else:
-                timer_html = f"<div style='color: #ff4b4b; font-size: 0.9em; margin-top: 5px;'>⚠️ Overdue</div>"
-        except:
-            pass
-
-    # Render Card
-    col_card, col_actions = st.columns([5, 1])
-    
-    with col_card:
-        st.markdown(f"""
+    due_dt = task.get("_due_dt")
+    if due_dt and s not in ("completed", "canceled"):
+        delta = due_dt - now
+        total_seconds = delta.total_seconds()
+        
+        if total_seconds > 0:
+            days = delta.days
+            hours = delta.seconds // 3600
+            minutes = (delta.seconds % 3600) // 60
+            t_color = "#ff4b4b" if total_seconds < 3600 else "#666"
+            timer_html = f"<div style='color: {t_color}; font-size: 0.9em; margin-top: 5px;'>⏳ Time left: {days}d {hours}h {minutes}m</div>"
+        else:
+            timer_html = OVERDUE_HTML
+
+    border_color = STATUS_BORDER.get(s, "#9e9e9e")
+    p_icon = PRIORITY_ICON.get(p, "🔵")
+
+    return f"""
     <div style="border: 3px solid {border_color}; border-radius: 10px; padding: 15px; margin-bottom: 15px; background-color: #1e1e1e;">
         <h3 style="margin: 0; color: {border_color};">{task['title']}</h3>
         <div style="display: flex; justify-content: space-between; margin-top: 5px;">
@@ -186,14 +171,57 @@ for task in tasks:
         {timer_html}
         <div style="font-size: 0.8em; color: #888; margin-top: 10px;">ID: {task['id']}</div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    with col_actions:
-        st.write("") # Spacer
-        st.write("") # Spacer
-        if st.button("✏️", key=f"edit_{task['id']}"):
-            st.session_state.edit_task_id = task['id']
-            st.rerun()
-        if st.button("🗑️", key=f"del_{task['id']}"):
-            agent.task_tools.update_task(task['id'], status="canceled")
-            st.rerun()
\ No newline at end of file
+    """
+
+def cancel_task(task_id: int):
+    """Delete button handler: cancel the task before the board re-renders"""
+    agent.task_tools.update_task(task_id, status="canceled")
+
+def start_edit(task_id: int):
+    """Edit button handler: open the task in the sidebar"""
+    st.session_state.edit_task_id = task_id
+
+# The board is a fragment: filtering or cancelling a task re-renders only the board
+# instead of rerunning the chat, the priority sweep and the sidebar
+@st.fragment
+def task_board():
+    # List all tasks
+    st.header("Task Board")
+
+    # Filter
+    filter_option = st.radio("Filter:", ["All Tasks", *STATUS_BY_LABEL], horizontal=True)
+
+    # Get tasks directly from tools for custom rendering; a status filter reads its bucket
+    tasks = agent.task_tools.list_tasks(STATUS_BY_LABEL.get(filter_option))
+
+    # Always Order by Priority: one pass into per-priority buckets (unknown priorities last).
+    # Builds a new list, so the shared list_tasks result is never reordered.
+    hi, med, lo, other = [], [], [], []
+    buckets = {"high": hi, "medium": med, "low": lo}
+    for t in tasks:
+        buckets.get(t.get("priority", "medium"), other).append(t)
+    tasks = hi + med + lo + other
+
+    # Render all cards in a single element instead of one markdown + columns + buttons per task
+    now = datetime.now()
+    st.markdown("".join(render_card(task, now) for task in tasks), unsafe_allow_html=True)
+
+    # Task Actions (one selector for the whole board)
+    if tasks:
+        titles = {task['id']: task['title'] for task in tasks}
+        col_select, col_edit, col_delete = st.columns([4, 1, 1])
+        with col_select:
+            selected_id = st.selectbox(
+                "Task",
+                list(titles),
+                format_func=lambda task_id: f"{task_id}: {titles[task_id]}",
+                label_visibility="collapsed",
+            )
+        with col_edit:
+            # The edit form lives in the sidebar, outside the fragment, so this needs a full rerun
+            if st.button("✏️ Edit", on_click=start_edit, args=(selected_id,)):
+                st.rerun()
+        with col_delete:
+            st.button("🗑️ Delete", on_click=cancel_task, args=(selected_id,))
+
+task_board()
@@ -1,23 +1,169 @@
 """
 Task Management Tools
-Used by AI agents to manage tasks (in-memory storage)
+Used by AI agents to manage tasks (in-memory storage, persisted to an append-only log)
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
+from collections import Counter
 from datetime import datetime
+import bisect
 import itertools
 
+import orjson
+
+from config import env
 from observability.langfuse_config import log_agent_event
 
+# Read-only lookups run on every UI rerun, so they are only logged when debugging
+_DEBUG = env().task_debug
+
 # In-memory task storage
 tasks_db: List[Dict] = []
 
+# Index over tasks_db by task ID
+_tasks_by_id: Dict[int, Dict] = {}
+
 # Safe incremental ID generator
 _task_id_counter = itertools.count(start=1)
 
+# Bumped on every mutation so callers can invalidate derived caches
+_revision = 0
+
+
+def _bump_revision() -> None:
+    global _revision
+    _revision += 1
+
+
+STATUSES = ("pending", "in_progress", "completed", "canceled")
+PRIORITIES = ("low", "medium", "high")
+
+# Tasks grouped by status, kept in sync with tasks_db on every mutation.
+# Statuses outside STATUSES get a bucket on first use.
+_by_status: Dict[str, List[Dict]] = {s: [] for s in STATUSES}
+
+# Lowercased title -> tasks with that title, ordered by ID; kept in sync on every mutation
+_by_title_lower: Dict[str, List[Dict]] = {}
+
+# (revision, tuple(tasks_db)) handed out by unfiltered list_tasks() calls
+_all_tasks_cache: Optional[Tuple[int, Tuple[Dict, ...]]] = None
+
+
+def _index_title(task: Dict) -> None:
+    """Add the task to the title index, keeping each title's tasks ordered by ID"""
+    bisect.insort(_by_title_lower.setdefault(task["title"].lower(), []), task, key=lambda t: t["id"])
+
+
+def _unindex_title(task: Dict) -> None:
+    """Remove the task from the title index"""
+    key = task["title"].lower()
+    same_title = _by_title_lower[key]
+    same_title.remove(task)
+    if not same_title:
+        del _by_title_lower[key]
+
+
+def _parse_due_date(due_date: Optional[str]) -> Optional[datetime]:
+    """Parse a YYYY-MM-DD due date, returning None when absent or invalid"""
+    if not due_date:
+        return None
+    try:
+        return datetime.fromisoformat(due_date)
+    except (TypeError, ValueError):
+        return None
+
+
+# Each mutation appends one {"op", "payload"} line; replaying the lines rebuilds the store
+_TASKS_LOG_PATH = env().tasks_log_path
+
+# Opened on the first write
+_log_file = None
+
+
+def _persisted_fields(task: Dict) -> Dict:
+    """Return the task without derived fields"""
+    return {k: v for k, v in task.items() if k != "_due_dt"}
+
+
+def _append_log(op: str, payload: Dict) -> None:
+    """Append one mutation to the task log"""
+    global _log_file
+    if not _TASKS_LOG_PATH:
+        return
+    if _log_file is None:
+        _log_file = open(_TASKS_LOG_PATH, "ab")
+    _log_file.write(orjson.dumps({"op": op, "payload": payload}) + b"\n")
+    _log_file.flush()
+
+
+def _replay_log() -> None:
+    """Rebuild the task store from the task log, if there is one"""
+    global _task_id_counter
+    if not _TASKS_LOG_PATH:
+        return
+    try:
+        log = open(_TASKS_LOG_PATH, "rb")
+    except FileNotFoundError:
+        return
+
+    max_id = 0
+    line = b""
+    with log:
+        for line in log:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A write torn by a crash; the mutation never completed
+                continue
+            op, payload = record.get("op"), record.get("payload") or {}
+            task = _tasks_by_id.get(payload.get("id"))
+
+            if op == "create":
+                task = dict(payload, _due_dt=_parse_due_date(payload.get("due_date")))
+                tasks_db.append(task)
+                _tasks_by_id[task["id"]] = task
+                _by_status.setdefault(task["status"], []).append(task)
+                _index_title(task)
+                max_id = max(max_id, task["id"])
+            elif op == "update" and task:
+                if payload.get("status", task["status"]) != task["status"]:
+                    _by_status[task["status"]].remove(task)
+                    _by_status.setdefault(payload["status"], []).append(task)
+                _unindex_title(task)
+                task.update(payload)
+                task["_due_dt"] = _parse_due_date(task.get("due_date"))
+                _index_title(task)
+            elif op == "delete" and task:
+                del _tasks_by_id[task["id"]]
+                tasks_db.remove(task)
+                _by_status[task["status"]].remove(task)
+                _unindex_title(task)
+
+    # Terminate a torn final line so the next append starts a fresh record
+    if line and not line.endswith(b"\n"):
+        with open(_TASKS_LOG_PATH, "ab") as log:
+            log.write(b"\n")
+
+    # IDs are never reused, even those of deleted tasks
+    _task_id_counter = itertools.count(start=max_id + 1)
+
+
+_replay_log()
+
 
 class TaskTools:
     """Tools for task management operations"""
 
+    @staticmethod
+    def revision() -> int:
+        """Return a counter that changes whenever the task store is mutated"""
+        return _revision
+
+    @staticmethod
+    def get_by_title_lower(title_lower: str) -> Optional[Dict]:
+        """Return the lowest-ID task whose lowercased title equals title_lower"""
+        same_title = _by_title_lower.get(title_lower)
+        return same_title[0] if same_title else None
+
     @staticmethod
     def create_task(
         title: str,
@@ -31,12 +177,19 @@ class TaskTools:
             "description": description,
             "priority": priority.lower(),
             "due_date": due_date,
+            # Parsed due_date, cached so callers don't re-parse it
+            "_due_dt": _parse_due_date(due_date),
             "status": "pending",
             "created_at": datetime.utcnow().isoformat(),
             "completed_at": None,
         }
 
         tasks_db.append(task)
+        _tasks_by_id[task["id"]] = task
+        _by_status["pending"].append(task)
+        _index_title(task)
+        _bump_revision()
+        _append_log("create", _persisted_fields(task))
 
         log_agent_event(
             "task_created",
@@ -50,25 +203,35 @@ class TaskTools:
         return task
 
     @staticmethod
-    def list_tasks(status: Optional[str] = None) -> List[Dict]:
+    def list_tasks(status: Optional[str] = None) -> Sequence[Dict]:
+        """
+        List tasks, optionally only those with the given status
+
+        A filtered result is the live status bucket; callers must not mutate it.
+        An unfiltered result is a tuple shared until the next mutation.
+        """
+        global _all_tasks_cache
         if status:
-            result = [t for t in tasks_db if t["status"] == status]
+            result = _by_status.get(status, [])
         else:
-            result = list(tasks_db)
+            if _all_tasks_cache is None or _all_tasks_cache[0] != _revision:
+                _all_tasks_cache = (_revision, tuple(tasks_db))
+            result = _all_tasks_cache[1]
 
-        log_agent_event(
-            "tasks_listed",
-            "task_tools",
-            {"status": status, "count": len(result)},
-        )
+        if _DEBUG:
+            log_agent_event(
+                "tasks_listed",
+                "task_tools",
+                {"status": status, "count": len(result)},
+            )
 
         return result
 
     @staticmethod
     def get_task(task_id: int) -> Optional[Dict]:
-        task = next((t for t in tasks_db if t["id"] == task_id), None)
+        task = _tasks_by_id.get(task_id)
 
-        if task:
+        if _DEBUG and task:
             log_agent_event(
                 "task_retrieved",
                 "task_tools",
@@ -92,18 +255,27 @@ class TaskTools:
             return None
 
         if title:
+            _unindex_title(task)
             task["title"] = title
+            _index_title(task)
         if description:
             task["description"] = description
         if priority:
             task["priority"] = priority.lower()
         if due_date:
             task["due_date"] = due_date
+            task["_due_dt"] = _parse_due_date(due_date)
         if status:
+            if status.lower() != task["status"]:
+                _by_status[task["status"]].remove(task)
+                _by_status.setdefault(status.lower(), []).append(task)
             task["status"] = status.lower()
             if status.lower() == "completed":
                 task["completed_at"] = datetime.utcnow().isoformat()
 
+        _bump_revision()
+        _append_log("update", _persisted_fields(task))
+
         log_agent_event(
             "task_updated",
             "task_tools",
@@ -118,13 +290,15 @@ class TaskTools:
 
     @staticmethod
     def delete_task(task_id: int) -> bool:
-        global tasks_db
-        before = len(tasks_db)
-        tasks_db = [t for t in tasks_db if t["id"] != task_id]
-
-        deleted = len(tasks_db) < before
+        task = _tasks_by_id.pop(task_id, None)
+        deleted = task is not None
 
         if deleted:
+            tasks_db.remove(task)
+            _by_status[task["status"]].remove(task)
+            _unindex_title(task)
+            _bump_revision()
+            _append_log("delete", {"id": task_id})
             log_agent_event(
                 "task_deleted",
                 "task_tools",
@@ -135,14 +309,17 @@ class TaskTools:
 
     @staticmethod
     def get_statistics() -> Dict:
+        # Status counts are the bucket sizes; priorities take one pass
+        priority_counts = Counter(t["priority"] for t in tasks_db)
+
         stats = {
             "total": len(tasks_db),
-            "pending": len([t for t in tasks_db if t["status"] == "pending"]),
-            "in_progress": len([t for t in tasks_db if t["status"] == "in_progress"]),
-            "completed": len([t for t in tasks_db if t["status"] == "completed"]),
-            "high_priority": len([t for t in tasks_db if t["priority"] == "high"]),
-            "medium_priority": len([t for t in tasks_db if t["priority"] == "medium"]),
-            "low_priority": len([t for t in tasks_db if t["priority"] == "low"]),
+            "pending": len(_by_status["pending"]),
+            "in_progress": len(_by_status["in_progress"]),
+            "completed": len(_by_status["completed"]),
+            "high_priority": priority_counts["high"],
+            "medium_priority": priority_counts["medium"],
+            "low_priority": priority_counts["low"],
         }
 
         log_agent_event(